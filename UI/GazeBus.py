@@ -0,0 +1,217 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import deque
+
+
+class GazeBus:
+    """In-process publish/subscribe bus for gaze2d samples.
+
+    Producers (the glasses recorder or a GazeReplay) call publish() from their
+    own thread right after a sample is decoded. Subscribers are called
+    synchronously on that thread, so they must be cheap (store a value, bump a
+    counter) and must not touch Qt widgets directly.
+
+    Samples where the glasses lost the gaze (blink, looking away) are published
+    with gaze2d=None and count as outside the region.
+
+    Latency is measured in two parts and compared against one display frame:
+    - backlog: how far a sample is behind the stream when it is published. The
+      smallest (t_decode - gaze_ts) seen so far is taken as zero lag, so time
+      spent queued in the decoder shows up as growth of that difference.
+    - end to end: backlog plus the time from decode until a consumer reports
+      the sample reached it, via record_delivery() (e.g. from the Qt thread).
+    """
+
+    def __init__(self, refresh_hz=60, region=None, history=1000):
+        self.frame_budget = 1.0 / refresh_hz
+        self.region = region  # (x0, y0, x1, y1) in normalised gaze2d coordinates
+        self.in_region = None
+        self.latest = None  # (gaze_ts, gaze2d, t_decode)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._min_offset = None
+        self._backlog = deque(maxlen=history)
+        self._latencies = deque(maxlen=history)
+        self.count = 0
+        self.deliveries = 0
+        self.backlog_overruns = 0
+        self.overruns = 0
+        self.max_backlog = 0.0
+        self.max_latency = 0.0
+        self._last_warning = 0.0
+
+    def subscribe(self, callback):
+        """Register callback(gaze_ts, gaze2d, in_region, t_decode, backlog)."""
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [cb for cb in self._subscribers if cb is not callback]
+
+    def contains(self, gaze2d):
+        if not gaze2d:
+            return False
+        if self.region is None:
+            return True
+        x0, y0, x1, y1 = self.region
+        x, y = gaze2d[0], gaze2d[1]
+        return x0 <= x <= x1 and y0 <= y <= y1
+
+    def age(self):
+        """Seconds since the latest sample was decoded, or None if there is none."""
+        latest = self.latest
+        if latest is None:
+            return None
+        return time.perf_counter() - latest[2]
+
+    def publish(self, gaze_ts, gaze2d, t_decode=None):
+        """Deliver a sample to all subscribers and return its backlog in seconds.
+
+        gaze_ts is the stream timestamp in seconds; t_decode is the
+        time.perf_counter() value taken as soon as the sample came out of the
+        decoder and defaults to now.
+        """
+        if t_decode is None:
+            t_decode = time.perf_counter()
+        offset = t_decode - gaze_ts
+        if self._min_offset is None or offset < self._min_offset:
+            self._min_offset = offset
+        backlog = offset - self._min_offset
+
+        in_region = self.contains(gaze2d)
+        self.latest = (gaze_ts, gaze2d, t_decode)
+        self.in_region = in_region
+
+        self._backlog.append(backlog)
+        self.count += 1
+        self.max_backlog = max(self.max_backlog, backlog)
+        if backlog > self.frame_budget:
+            self.backlog_overruns += 1
+            self._warn(f"Gaze stream is {backlog * 1000:.1f} ms behind")
+
+        # The subscriber list is replaced, never mutated, so no lock is needed here
+        for callback in self._subscribers:
+            try:
+                callback(gaze_ts, gaze2d, in_region, t_decode, backlog)
+            except Exception as e:
+                logging.error(f"Gaze subscriber {callback} failed: {e}")
+        return backlog
+
+    def record_delivery(self, t_decode, backlog):
+        """Record that a sample reached its consumer now; returns end-to-end latency."""
+        latency = backlog + time.perf_counter() - t_decode
+        self._latencies.append(latency)
+        self.deliveries += 1
+        self.max_latency = max(self.max_latency, latency)
+        if latency > self.frame_budget:
+            self.overruns += 1
+            self._warn(f"Gaze delivery took {latency * 1000:.1f} ms")
+        return latency
+
+    def _warn(self, message):
+        # At most one warning per second so overruns do not flood the console
+        now = time.perf_counter()
+        if now - self._last_warning >= 1.0:
+            self._last_warning = now
+            logging.warning(f"{message} (budget {self.frame_budget * 1000:.1f} ms)")
+
+    @staticmethod
+    def _summary(values):
+        values = sorted(values)
+        if not values:
+            return {"window": 0}
+        return {
+            "window": len(values),
+            "mean_ms": 1000 * sum(values) / len(values),
+            "p50_ms": 1000 * values[len(values) // 2],
+            "p99_ms": 1000 * values[min(len(values) - 1, int(len(values) * 0.99))],
+        }
+
+    def latency_report(self):
+        """Summary of backlog and end-to-end latency in milliseconds.
+
+        count, deliveries, max and overrun figures cover the whole run;
+        mean/p50/p99 cover only the last `window` samples.
+        """
+        return {
+            "budget_ms": 1000 * self.frame_budget,
+            "count": self.count,
+            "backlog": {
+                **self._summary(self._backlog),
+                "max_ms": 1000 * self.max_backlog,
+                "overruns": self.backlog_overruns,
+            },
+            "end_to_end": {
+                **self._summary(self._latencies),
+                "deliveries": self.deliveries,
+                "max_ms": 1000 * self.max_latency,
+                "overruns": self.overruns,
+            },
+        }
+
+
+def load_gaze_file(file_path):
+    """Read every {'gaze_ts', 'gaze2d'} record pickled by Recorder.record_gaze."""
+    samples = []
+    with open(file_path, "rb") as f:
+        while True:
+            try:
+                samples.append(pickle.load(f))
+            except EOFError:
+                break
+    return samples
+
+
+class GazeReplay(threading.Thread):
+    """Replays a recorded gaze_data.p file into a GazeBus as a stand-in for the glasses."""
+
+    def __init__(self, file_path, bus, speed=1.0, loop=False):
+        super().__init__(daemon=True)
+        self.samples = load_gaze_file(file_path)
+        self.bus = bus
+        self.speed = speed
+        self.loop = loop
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self._replay_once()
+            if not self.loop:
+                break
+
+    def _replay_once(self):
+        if not self.samples:
+            return
+        start_wall = time.perf_counter()
+        start_ts = self.samples[0]["gaze_ts"]
+        for sample in self.samples:
+            if self.stop_event.is_set():
+                return
+            if self.speed > 0:
+                due = start_wall + (sample["gaze_ts"] - start_ts) / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self.bus.publish(sample["gaze_ts"], sample.get("gaze2d"), time.perf_counter())
+
+    def stop(self):
+        self.stop_event.set()
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    default_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "recordings", "gaze_data.p")
+    gaze_file = sys.argv[1] if len(sys.argv) > 1 else default_file
+    bus = GazeBus()
+    # No UI here, so delivery is recorded straight from the subscriber
+    bus.subscribe(lambda ts, gaze2d, in_region, t_decode, backlog: bus.record_delivery(t_decode, backlog))
+    replay = GazeReplay(gaze_file, bus)
+    replay.start()
+    replay.join()
+    print(bus.latency_report())
@@ -2,7 +2,7 @@ import pandas as pd
 import os
 import json
 import time
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox, QRadioButton, QButtonGroup
 )
@@ -14,7 +14,9 @@ import random
 
 
 class TrialDisplayUI(QMainWindow):
-    def __init__(self, csv_path, audio_dir, unique_id, data_directory):
+    gazeReceived = Signal(float, float)  # (t_decode, backlog), queued to the UI thread
+
+    def __init__(self, csv_path, audio_dir, unique_id, data_directory, gaze_bus=None):
         super().__init__()
         self.csv_path = csv_path
         self.audio_dir = audio_dir
@@ -42,6 +44,17 @@ class TrialDisplayUI(QMainWindow):
             i for i, device in enumerate(devices) if "Eris 3.5BT" in device['name']
         ]
 
+        # Gaze state, updated from the gaze bus thread
+        self.gaze_bus = gaze_bus
+        self.latest_gaze = None
+        self.gaze_at_onset = None
+        self.gaze_exits = 0
+        self.audio_playing = False
+        self.gaze_pending = False
+        if self.gaze_bus is not None:
+            self.gazeReceived.connect(self.onGazeDelivered)
+            self.gaze_bus.subscribe(self.onGaze)
+
         # Initialize UI elements
         self.initUI()
 
@@ -108,10 +121,48 @@ class TrialDisplayUI(QMainWindow):
                 button.hide()
             self.submit_button.hide()
 
+    def onGaze(self, gaze_ts, gaze2d, in_region, t_decode, backlog):
+        """Called on the gaze bus thread; keep it to plain attribute updates."""
+        previous = self.latest_gaze
+        self.latest_gaze = (gaze_ts, gaze2d, in_region)
+        if self.audio_playing and not in_region and (previous is None or previous[2]):
+            self.gaze_exits += 1
+        # Only one sample in flight to the UI thread, so a busy UI is not flooded
+        if not self.gaze_pending:
+            self.gaze_pending = True
+            self.gazeReceived.emit(t_decode, backlog)
+
+    def onGazeDelivered(self, t_decode, backlog):
+        """Runs on the UI thread; measures how long the sample took to get here."""
+        self.gaze_pending = False
+        self.gaze_bus.record_delivery(t_decode, backlog)
+
+    def gazeAtOnset(self):
+        """Latest gaze sample, marked stale if older than a few display frames."""
+        latest = self.latest_gaze
+        age = self.gaze_bus.age()
+        if latest is None or age is None:
+            return {"status": "missing"}
+        gaze_ts, gaze2d, in_region = latest
+        return {
+            "status": "stale" if age > 3 * self.gaze_bus.frame_budget else "ok",
+            "age_ms": 1000 * age,
+            "gaze_ts": gaze_ts,
+            "gaze2d": list(gaze2d) if gaze2d else None,
+            "in_region": in_region,
+        }
+
     def playCurrentAudio(self):
         trial = self.trials_data.iloc[self.current_trial_index]
         audio_files = [trial['Device-1'], trial['Device-2'], trial['Device-3']]
-        self.playAudio(audio_files)
+        if self.gaze_bus is not None:
+            self.gaze_at_onset = self.gazeAtOnset()
+        self.gaze_exits = 0
+        self.audio_playing = True
+        try:
+            self.playAudio(audio_files)
+        finally:
+            self.audio_playing = False
         self.trial_label.hide()
         self.attended_label.hide()
         self.play_button.hide()
@@ -174,6 +225,9 @@ class TrialDisplayUI(QMainWindow):
             "Selected Answer": selected_answer,
             "Correct": is_correct,
         }
+        if self.gaze_bus is not None:
+            answer_data["Gaze at Onset"] = self.gaze_at_onset
+            answer_data["Gaze Exits"] = self.gaze_exits
         self.append_to_json(answer_data)
 
         self.current_trial_index += 1
@@ -219,3 +273,8 @@ class TrialDisplayUI(QMainWindow):
             thread.start()
         for thread in threads:
             thread.join()
+
+    def closeEvent(self, event):
+        if self.gaze_bus is not None:
+            self.gaze_bus.unsubscribe(self.onGaze)
+        super().closeEvent(event)
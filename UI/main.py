@@ -2,8 +2,61 @@ import sys
 from PySide6.QtWidgets import QApplication
 from DemographicUI import DemographicUI
 from TrialDisplayUI import TrialDisplayUI
+from GazeBus import GazeBus, GazeReplay
 import os
 import uuid
+import asyncio
+import threading
+import logging
+import dotenv
+
+logging.basicConfig(level=logging.INFO)
+
+
+def start_gaze_source(gaze_bus, participant_folder):
+    """Feed the gaze bus from a recorded file (GAZE_REPLAY) or the glasses (G3_HOSTNAME).
+
+    Returns a function that stops the source, or None if neither is configured
+    or the glasses recorder cannot be loaded. With the glasses, gaze is also
+    recorded to gaze_data.p in the participant folder.
+    """
+    dotenv.load_dotenv()
+    replay_file = os.environ.get("GAZE_REPLAY")
+    if replay_file:
+        replay = GazeReplay(replay_file, gaze_bus, loop=True)
+        replay.start()
+        return replay.stop
+
+    if os.environ.get("G3_HOSTNAME"):
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        try:
+            from record_signals import Recorder, configs
+        except ImportError as e:
+            logging.error(f"Gaze recording disabled, could not load the glasses recorder: {e}")
+            return None
+
+        recorder = Recorder({**configs, 'save_dir': participant_folder}, gaze_bus=gaze_bus)
+
+        def record():
+            try:
+                asyncio.run(recorder.record_gaze())
+            except Exception:
+                # Trials carry on; their gaze-at-onset is marked stale once samples stop
+                logging.exception("Gaze recorder stopped with an error, no more gaze samples")
+
+        thread = threading.Thread(target=record, daemon=True)
+        thread.start()
+
+        def stop():
+            # Let record_gaze finish its teardown and flush the pickle file
+            recorder.stop_event.set()
+            thread.join(timeout=5)
+            if thread.is_alive():
+                logging.warning("Gaze recorder did not stop within 5 s")
+
+        return stop
+
+    return None
 
 
 def main():
@@ -19,6 +72,13 @@ def main():
     participant_folder = os.path.join(data_directory, unique_id)
     os.makedirs(participant_folder, exist_ok=True)
 
+    # Gaze bus; the region is the central part of the scene camera in gaze2d coordinates
+    refresh_hz = app.primaryScreen().refreshRate() or 60
+    gaze_bus = GazeBus(refresh_hz=refresh_hz, region=(0.25, 0.25, 0.75, 0.75))
+    stop_gaze = start_gaze_source(gaze_bus, participant_folder)
+    if stop_gaze is None:
+        gaze_bus = None
+
     # Initialize DemographicUI
     demographic_ui = DemographicUI(unique_id, data_directory)
 
@@ -32,7 +92,7 @@ def main():
 
         try:
             # Initialize and keep a reference to TrialDisplayUI
-            trial_display_ui = TrialDisplayUI(csv_path, audio_directory, unique_id, data_directory)
+            trial_display_ui = TrialDisplayUI(csv_path, audio_directory, unique_id, data_directory, gaze_bus)
             trial_display_ui_container["window"] = trial_display_ui
             trial_display_ui.show()
             print("TrialDisplayUI opened successfully!")
@@ -46,7 +106,11 @@ def main():
     demographic_ui.show()
 
     # Start the application
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    if stop_gaze is not None:
+        stop_gaze()
+        logging.info(f"Gaze bus latency: {gaze_bus.latency_report()}")
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
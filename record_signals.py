@@ -27,8 +27,9 @@ configs={
 
 #@dataclass(slots=True)
 class Recorder():
-    def __init__(self, configs):
+    def __init__(self, configs, gaze_bus=None):
         self.configs = configs
+        self.gaze_bus = gaze_bus
         self.stop_event = threading.Event()
         self.create_folder('recordings')
 
@@ -59,9 +60,12 @@ class Recorder():
                         while gaze_timestamp is None:
                             if gaze_timestamp is None:
                                 gaze, gaze_timestamp = await gaze_stream.get()
+                        t_decode = time.perf_counter()
 
-                        self.log(f"Gaze timestamp: {gaze_timestamp}")
-                        
+                        # Publish before logging/pickling to keep the UI path short;
+                        # samples without gaze2d (gaze lost) go out as None
+                        if self.gaze_bus is not None:
+                            self.gaze_bus.publish(gaze_timestamp, gaze.get('gaze2d'), t_decode)
 
                         # If given gaze data
                         if "gaze2d" in gaze:
@@ -69,6 +73,8 @@ class Recorder():
 
                     time_end = time.time()
                     self.log(f'Running time: {time_end-time_start}')
+                    if self.gaze_bus is not None:
+                        self.log(f'Gaze bus latency: {self.gaze_bus.latency_report()}')
 
         file.close()
 
@@ -0,0 +1,264 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+
+logging.basicConfig(level=logging.INFO)
+
+configs = {
+    'data_dir': './data',
+    'trials_csv': 'audio_stimuli_data/trials.csv',
+    'index_file': './data/results_index.sqlite',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    participant_id TEXT PRIMARY KEY,
+    submission_time TEXT,
+    gender TEXT,
+    age INTEGER,
+    race_ethnicity TEXT,
+    hand_preference TEXT,
+    ear_preference TEXT
+);
+CREATE TABLE IF NOT EXISTS answers (
+    participant_id TEXT NOT NULL,
+    trial_no INTEGER NOT NULL,
+    selected_answer TEXT,
+    correct INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_trial_correct ON answers (trial_no, correct);
+CREATE INDEX IF NOT EXISTS answers_participant_correct ON answers (participant_id, correct);
+CREATE TABLE IF NOT EXISTS trials (
+    trial_no INTEGER PRIMARY KEY,
+    attended_speaker INTEGER,
+    device_1 TEXT,
+    device_2 TEXT,
+    device_3 TEXT,
+    question TEXT
+);
+"""
+
+# Demographic columns that can be used for grouping in accuracy_by_group
+GROUP_COLUMNS = ('gender', 'age', 'race_ethnicity', 'hand_preference', 'ear_preference')
+
+
+class ResultsIndex():
+    """Incremental SQLite index over the data/<uuid> participant folders.
+
+    Only sessions whose demographic.json or answers.json changed (by mtime and
+    size) since the last update() are re-read, so aggregate queries run against
+    the index instead of parsing every JSON file.
+    """
+
+    def __init__(self, configs):
+        self.configs = configs
+        index_dir = os.path.dirname(self.configs['index_file'])
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        self.conn = sqlite3.connect(self.configs['index_file'])
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _changed(self, path, seen):
+        """Return the (mtime_ns, size) stamp of path if it differs from the index, else None."""
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        return None if seen.get(path) == stamp else stamp
+
+    def update(self):
+        """Ingest new or changed sessions and drop deleted ones. Returns the number re-ingested."""
+        seen = {path: (mtime, size) for path, mtime, size in self.conn.execute("SELECT path, mtime_ns, size FROM files")}
+        updated = 0
+        with self.conn:
+            # Stored paths are absolute so 'data', './data' and /abs/data share stamps
+            trials_csv = os.path.abspath(self.configs['trials_csv'])
+            stamp = self._changed(trials_csv, seen)
+            if stamp is not None:
+                self.ingest_trials(trials_csv)
+                self._mark(trials_csv, stamp)
+
+            data_dir = os.path.abspath(self.configs['data_dir'])
+            present = set()
+            for entry in os.scandir(data_dir):
+                if not entry.is_dir():
+                    continue
+                participant_id = entry.name
+                session_files = [os.path.join(entry.path, name) for name in ('demographic.json', 'answers.json')]
+                try:
+                    removed = [path for path in session_files if not os.path.exists(path) and path in seen]
+                    files = [path for path in session_files if os.path.exists(path)]
+                    if not files:
+                        continue
+                    present.add(participant_id)
+                    stamps = {path: self._changed(path, seen) for path in files}
+                    if not removed and all(stamp is None for stamp in stamps.values()):
+                        continue
+                    self.ingest_session(participant_id, entry.path)
+                except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                    # Session still being written or corrupt; its old rows stay and it is retried next update
+                    logging.warning(f"Skipping session {participant_id}: {e!r}")
+                    if any(path in seen for path in session_files):
+                        present.add(participant_id)
+                    continue
+                for path, stamp in stamps.items():
+                    if stamp is not None:
+                        self._mark(path, stamp)
+                for path in removed:
+                    self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                updated += 1
+
+            indexed = {row[0] for row in self.conn.execute("SELECT participant_id FROM sessions")}
+            indexed |= {row[0] for row in self.conn.execute("SELECT DISTINCT participant_id FROM answers")}
+            for participant_id in indexed - present:
+                self._delete_session(participant_id)
+                # Prefix range instead of LIKE, so '_' and '%' in paths are not wildcards
+                prefix = os.path.join(data_dir, participant_id, '')
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                self.conn.execute("DELETE FROM files WHERE path >= ? AND path < ?", (prefix, upper))
+        return updated
+
+    def _mark(self, path, stamp):
+        self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (path, *stamp))
+
+    def _delete_session(self, participant_id):
+        self.conn.execute("DELETE FROM sessions WHERE participant_id = ?", (participant_id,))
+        self.conn.execute("DELETE FROM answers WHERE participant_id = ?", (participant_id,))
+
+    def ingest_session(self, participant_id, folder):
+        """Replace the session's rows; everything is parsed before the old rows are deleted."""
+        demographic = None
+        demographic_file = os.path.join(folder, 'demographic.json')
+        if os.path.exists(demographic_file):
+            with open(demographic_file, 'r') as f:
+                demographic = json.load(f)
+        answers = []
+        answers_file = os.path.join(folder, 'answers.json')
+        if os.path.exists(answers_file):
+            with open(answers_file, 'r') as f:
+                answers = json.load(f)
+
+        if demographic is not None and not isinstance(demographic, dict):
+            raise ValueError("demographic.json is not an object")
+        if not isinstance(answers, list) or not all(isinstance(answer, dict) for answer in answers):
+            raise ValueError("answers.json is not a list of objects")
+
+        session_row = None
+        if demographic is not None:
+            age = demographic.get('Age')
+            race_ethnicity = demographic.get('Race & Ethnicity')
+            if isinstance(race_ethnicity, str):
+                race_ethnicity = [race_ethnicity]
+            elif not isinstance(race_ethnicity, list):
+                race_ethnicity = []
+            session_row = (
+                participant_id,
+                demographic.get('Submission Time'),
+                demographic.get('Gender'),
+                int(age) if str(age).strip().isdigit() else None,
+                json.dumps(sorted(str(item) for item in race_ethnicity)),
+                demographic.get('Hand Preference'),
+                demographic.get('Ear Preference'),
+            )
+        answer_rows = [
+            (participant_id, int(answer['Trial No.']), answer.get('Selected Answer'), int(answer.get('Correct', 0)))
+            for answer in answers
+        ]
+
+        self._delete_session(participant_id)
+        if session_row is not None:
+            self.conn.execute("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)", session_row)
+        self.conn.executemany("INSERT INTO answers VALUES (?, ?, ?, ?)", answer_rows)
+
+    def ingest_trials(self, trials_csv):
+        with open(trials_csv, newline='') as f:
+            rows = [
+                (int(row['Trial No.']), int(row['Attended Speaker']), row['Device-1'], row['Device-2'], row['Device-3'], row['Question'])
+                for row in csv.DictReader(f)
+            ]
+        self.conn.execute("DELETE FROM trials")
+        self.conn.executemany("INSERT INTO trials VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def _query(self, sql, params=()):
+        cursor = self.conn.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def accuracy_by_trial(self):
+        return self._query(
+            """
+            SELECT a.trial_no, t.attended_speaker, t.question, a.n, a.accuracy
+            FROM (
+                SELECT trial_no, COUNT(*) AS n, AVG(correct) AS accuracy
+                FROM answers GROUP BY trial_no
+            ) a LEFT JOIN trials t ON t.trial_no = a.trial_no
+            ORDER BY a.trial_no
+            """
+        )
+
+    def accuracy_by_speaker(self):
+        return self._query(
+            """
+            SELECT t.attended_speaker, SUM(a.n) AS n, 1.0 * SUM(a.correct) / SUM(a.n) AS accuracy
+            FROM (
+                SELECT trial_no, COUNT(*) AS n, SUM(correct) AS correct
+                FROM answers GROUP BY trial_no
+            ) a JOIN trials t ON t.trial_no = a.trial_no
+            GROUP BY t.attended_speaker ORDER BY t.attended_speaker
+            """
+        )
+
+    def accuracy_by_group(self, column):
+        if column not in GROUP_COLUMNS:
+            raise ValueError(f"Unknown demographic column {column!r}, expected one of {GROUP_COLUMNS}")
+        return self._query(
+            f"""
+            SELECT s.{column} AS grp, COUNT(*) AS participants,
+                   SUM(a.n) AS n, 1.0 * SUM(a.correct) / SUM(a.n) AS accuracy
+            FROM (
+                SELECT participant_id, COUNT(*) AS n, SUM(correct) AS correct
+                FROM answers GROUP BY participant_id
+            ) a JOIN sessions s ON s.participant_id = a.participant_id
+            GROUP BY s.{column} ORDER BY s.{column}
+            """
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index participant results and print accuracy summaries.")
+    parser.add_argument('--by', default='trial', help=f"trial, speaker, or one of {', '.join(GROUP_COLUMNS)}")
+    parser.add_argument('--data-dir', default=configs['data_dir'])
+    parser.add_argument('--trials-csv', default=configs['trials_csv'])
+    parser.add_argument('--index-file', default=None)
+    args = parser.parse_args()
+
+    index = ResultsIndex({
+        'data_dir': args.data_dir,
+        'trials_csv': args.trials_csv,
+        'index_file': args.index_file or os.path.join(args.data_dir, 'results_index.sqlite'),
+    })
+    try:
+        logging.info(f"Updated {index.update()} sessions")
+        if args.by == 'trial':
+            rows = index.accuracy_by_trial()
+        elif args.by == 'speaker':
+            rows = index.accuracy_by_speaker()
+        else:
+            rows = index.accuracy_by_group(args.by)
+        for row in rows:
+            print(row)
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()